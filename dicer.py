@@ -13,6 +13,191 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import random
 import re
+from collections import namedtuple
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，未安装时使用标准库的掷骰实现
+    np = None
+
+# 预编译的正则表达式，避免每次调用时重复查找正则缓存；均使用 fullmatch 匹配整个输入
+_DICE_RE = re.compile(r'(\d*)d(\d+)([+-]\d+)?')
+_R_RE = re.compile(r'\.r\s*(\d+)?')
+_M_RE = re.compile(r'\.m\s+-(\d+)\s+(.+)')
+_DT_RE = re.compile(r'\.(d|t)\s+(.+)')
+
+# 掷骰表达式支持的选项：孤注一掷、困难、极难
+_OPTIONS = frozenset(('-g', '-h', '-e'))
+
+# 各难度等级下需求值的除数：
+# - 默认难度：投出的点数只需要小于等于需求值即通过检定。
+# - 困难难度：投出的点数需要小于等于需求值的一半（向下取整）才能检定通过。
+# - 极难难度：投出的点数需要小于等于需求值的1/5（向下取整）才能检定通过。
+_DIFF_DIV = {'n': 1, 'h': 2, 'e': 5}
+# 各难度等级在结果中的名称
+_LVL_NAMES = {'n': '', 'h': '困难', 'e': '极难'}
+
+# 合并投掷的位数上限，超过后大整数除法的开销会抵消节省下来的随机数调用
+_BATCH_BITS_LIMIT = 256
+# 骰子数量达到该值时改用 numpy 一次性生成全部点数；实测在 64 个骰子以下，
+# numpy 的调用开销超过了单次取数拆分与逐个投掷节省下来的时间
+_NP_MIN_DICE = 64
+# 重复掷骰时全部投掷的骰子总数达到该值才改用 numpy 批量生成；批量生成省去了逐次调用的开销，
+# 实测盈亏点低于单次投掷，约在 16 到 48 个骰子之间
+_NP_MIN_BATCH = 32
+# numpy 使用 int64 存放点数与总和，单次投掷的最大可能总和不能超过该值
+_NP_MAX_SUM = 2 ** 63 - 1
+# 使用 random.choices 投掷的最大骰子面数；choices 以 floor(random() * n) 取值，
+# 并非严格均匀，面数不超过该值时各点数的概率偏差小于 2**-22
+_CHOICES_MAX_FACES = 2 ** 31 - 1
+# 乘法移位法基于 32 位随机数，适用的最大骰子面数
+_LEMIRE_MAX_FACES = 2 ** 32 - 1
+# 模块级的 numpy 随机数生成器
+_RNG = np.random.default_rng() if np is not None else None
+_RB = random.getrandbits
+# 解析结果缓存的容量上限，避免交互过程中缓存无限增长
+_PARSE_CACHE_SIZE = 1024
+
+# 掷骰表达式预解析的结果，重复掷骰时只需解析一次
+_ParsedExpression = namedtuple('_ParsedExpression', [
+    'dice_expression',  # 去除选项和需求值后的骰子表达式，例如 "1d100+2"
+    'num_dice',         # 骰子的数量
+    'dice_type',        # 骰子的面数
+    'modifier',         # 骰子的修正值
+    'modifier_str',     # 修正值在骰点详情中的写法，例如 "+2"，无修正值时为空字符串
+    'target',           # 需求值，未指定时为 None
+    'lvl',              # 难度等级，'n'、'h' 或 'e'
+    'gamble',           # 是否孤注一掷
+    'is_d100',          # 是否适用百面骰的大成功与大失败机制
+])
+
+
+def _parse_dice(dice_expression):
+    """
+    解析骰子表达式，返回骰子的数量、面数和修正值
+
+    Args:
+        dice_expression (str): 符合骰子表达式格式的字符串，例如 "2d6+3"
+
+    Raises:
+        ValueError: 如果传入的骰子表达式格式不正确或无法解析
+
+    Returns:
+        tuple: 依次为骰子的数量、骰子的面数、修正值（整数）和修正值在骰点详情中的写法（字符串）
+    """
+    # 输入验证
+    # 整个表达式都必须符合格式，末尾多余的字符会被直接拒绝
+    match = _DICE_RE.fullmatch(dice_expression.strip())
+    if not match:
+        raise ValueError("无效的表达式！")
+
+    # 骰子的数量，至少投掷一个骰子
+    num_dice = int(match.group(1)) if match.group(1) else 1
+    # 骰子的面数，至少为 1，校验放在解析阶段，掷骰时便不会再出错
+    dice_type = int(match.group(2))
+    if dice_type < 1:
+        raise ValueError("无效的表达式！")
+    # 骰子的修正值，默认为 0
+    modifier = int(match.group(3)) if match.group(3) else 0
+    # 修正值的带符号写法只在解析时生成一次，掷骰时直接拼接
+    modifier_str = f'{modifier:+d}' if modifier else ''
+    return num_dice, dice_type, modifier, modifier_str
+
+
+def _roll_k(k):
+    """
+    使用 Lemire 的乘法移位法投掷一个 k 面骰，并通过拒绝采样消除偏差
+
+    Args:
+        k (int): 骰子的面数，需满足 1 <= k <= _LEMIRE_MAX_FACES
+
+    Returns:
+        int: 投出的点数，范围为 1 到 k
+    """
+    m = _RB(32) * k
+    low = m & 0xFFFFFFFF
+    # 只有低 32 位落入 [0, 2**32 % k) 时才需要重新取数，绝大多数情况下不会进入循环
+    if low < k:
+        threshold = (0x100000000 - k) % k
+        while low < threshold:
+            m = _RB(32) * k
+            low = m & 0xFFFFFFFF
+    return (m >> 32) + 1
+
+
+def _roll_core(num_dice, dice_type):
+    """
+    投掷 num_dice 个 dice_type 面骰，只负责生成点数，不做任何字符串处理
+
+    Args:
+        num_dice (int): 骰子的数量
+        dice_type (int): 骰子的面数
+
+    Returns:
+        tuple: 包含两个元素的元组，第一个元素是所有骰子的点数之和（整数），第二个元素是每个骰子投出的点数序列
+    """
+    # numpy 可用且骰子数量较多时，一次性生成全部点数并做向量化求和
+    if _RNG is not None and num_dice >= _NP_MIN_DICE and num_dice * dice_type <= _NP_MAX_SUM:
+        rolls = _RNG.integers(1, dice_type + 1, size=num_dice)
+        return int(rolls.sum()), rolls
+
+    if num_dice > 1 and num_dice * dice_type.bit_length() <= _BATCH_BITS_LIMIT:
+        # 将 n 个 Y 面骰视为一个 Y**n 面骰，只取一次随机数，再逐位拆出每个骰子的点数
+        x = random.randrange(dice_type ** num_dice)
+        rolls = []
+        for _ in range(num_dice):
+            x, r = divmod(x, dice_type)
+            rolls.append(r + 1)
+    elif num_dice > 1 and dice_type <= _CHOICES_MAX_FACES:
+        # random.choices 一次生成全部点数，省去了逐个调用 randrange 的 Python 层开销
+        rolls = random.choices(range(1, dice_type + 1), k=num_dice)
+    elif dice_type <= _LEMIRE_MAX_FACES:
+        rolls = [_roll_k(dice_type) for _ in range(num_dice)]
+    else:
+        rolls = [random.randint(1, dice_type) for _ in range(num_dice)]
+    return sum(rolls), rolls
+
+
+def _batch_roll(num_dice, dice_type, num_trials):
+    """
+    使用 numpy 一次性完成多次相同的投掷，调用前需确认 numpy 可用
+
+    Args:
+        num_dice (int): 每次投掷的骰子数量
+        dice_type (int): 骰子的面数
+        num_trials (int): 投掷的次数
+
+    Returns:
+        numpy.ndarray: 形状为 (num_trials, num_dice) 的 int64 数组，每一行是一次投掷中每个骰子的点数
+    """
+    return _RNG.integers(1, dice_type + 1, size=(num_trials, num_dice))
+
+
+def _roll_and_format(num_dice, dice_type, modifier, modifier_str):
+    """
+    投掷骰子并生成骰点详情
+
+    Args:
+        num_dice (int): 骰子的数量
+        dice_type (int): 骰子的面数
+        modifier (int): 骰子的修正值
+        modifier_str (str): 修正值在骰点详情中的写法，例如 "+2"，无修正值时为空字符串
+
+    Returns:
+        tuple[int, str]: 返回一个元组，第一个元素是骰点结果（整数），第二个元素是骰点详情（字符串）
+    """
+    # total_rolls 为所有骰子的点数之和，rolls 为每个骰子投出的点数
+    total_rolls, rolls = _roll_core(num_dice, dice_type)
+    # total 为所有骰子的点数加上修正值
+    total = total_rolls + modifier
+
+    # numpy 数组先整体转换为 Python 整数列表，逐个访问数组元素的开销要大得多
+    if np is not None and isinstance(rolls, np.ndarray):
+        rolls = rolls.tolist()
+    # join 直接接收列表时无需再逐步迭代生成器
+    rolls_str = '+'.join([str(r) for r in rolls])
+    return total, f"{rolls_str}{modifier_str}"
 
 
 class DiceRoller:
@@ -29,6 +214,9 @@ class DiceRoller:
     - `roll_dice`: 根据传入的骰子表达式投掷骰子，返回骰点结果和骰点详情。
     - `check_success`: 根据不同的难度等级判定是否成功。
     - `evaluate_expression`: 分析掷骰表达式并做出相应动作，输出投点结果。
+    - `_parse_expression`: 解析掷骰表达式中的选项、需求值和骰子表达式。
+    - `_evaluate_parsed`: 根据预解析的掷骰表达式投掷一次骰子，输出投点结果。
+    - `_format_result`: 根据骰点结果和检定结果生成投点结果字符串。
     - `quick_roll`: 快速掷骰子并返回结果。
     - `repeat_roll`: 判别重复检定指令并执行相应的掷骰操作。
     - `_execute_rolls`: 根据指定的次数和掷骰表达式，执行重复掷骰操作并返回结果。
@@ -55,28 +243,7 @@ class DiceRoller:
             tuple[int, str]: 返回一个元组，第一个元素是骰点结果（整数），第二个元素是骰点详情（字符串）
         """
 
-        # 输入验证
-        match = re.match(r'(\d*)d(\d+)([+-]\d+)?', dice_expression)
-        if not match:
-            raise ValueError("无效的表达式！")
-
-        # 骰子的数量，至少投掷一个骰子
-        num_dice = int(match.group(1)) if match.group(1) else 1
-        # 骰子的面数
-        dice_type = int(match.group(2))
-        # 骰子的修正值，默认为 0
-        modifier = int(match.group(3)) if match.group(3) else 0
-
-        # rolls 为每个骰子投出的点数
-        rolls = [random.randint(1, dice_type) for _ in range(num_dice)]
-        # total 为所有骰子的点数加上修正值
-        total = sum(rolls) + modifier
-
-        # 返回骰点结果和骰点详情
-        roll_details = '+'.join(map(str, rolls))
-        if modifier != 0:
-            roll_details += f'{match.group(3)}'
-        return total, roll_details
+        return _roll_and_format(*_parse_dice(dice_expression))
 
     def check_success(self, target, total, lvl):
         """
@@ -90,16 +257,7 @@ class DiceRoller:
         Returns:
             tuple: 包含两个元素的元组，第一个元素是布尔值，表示是否成功；第二个元素是通过检定的阈值。
         """
-        # 困难难度：投出的点数需要小于等于需求值的一半（向下取整）才能检定通过。
-        if lvl == 'h':
-            threshold = target // 2
-        # 极难难度：投出的点数需要小于等于需求值的1/5（向下取整）才能检定通过。
-        elif lvl == 'e':
-            threshold = target // 5
-        # 默认难度：投出的点数只需要小于等于需求值即通过检定。
-        else:
-            threshold = target
-
+        threshold = target // _DIFF_DIV.get(lvl, 1)
         success = total <= threshold
         return success, threshold
 
@@ -121,54 +279,111 @@ class DiceRoller:
                 如果表达式解析或计算过程中出现错误，返回错误信息。
         """
         try:
-            # 初始化结果变量
-            roll_result = ""
-
-            # 处理选项
-            options = {'-g': False, '-h': False, '-e': False}
-            for option in options:
-                if option in expression:
-                    options[option] = True
-                    expression = expression.replace(option, '').strip()
-
-            # 难度分级
-            lvl_map = {'n': '', 'h': '困难', 'e': '极难'}
-            lvl = 'h' if options['-h'] else 'e' if options['-e'] else 'n'
-
-            # 需求值检定
-            if '/' in expression:
-                target, dice_expression = expression.split('/')
-                target = int(target)
-            else:
-                target, dice_expression = None, expression
-
-            total, roll_details = self.roll_dice(dice_expression.strip())
-
-            # 百面骰独有的大成功与大失败机制
-            if '1d100' in dice_expression:
-                if total == 1:
-                    return f"{dice_expression.strip()}: {roll_details}={total}, 大成功！"
-                if total >= 96:
-                    return f"{dice_expression.strip()}: {roll_details}={total}, 大失败！"
-
-            # 根据骰点结果和需求值进行判断
-            if target is not None:
-                success, threshold = self.check_success(target, total, lvl)
-                if success:
-                    roll_result = f"{total}<={threshold}, {lvl_map[lvl]}检定通过！"
-                else:
-                    if options['-g']:
-                        roll_result = f"{total}>{threshold}, {lvl_map[lvl]}孤注一掷失败，视为大失败！"
-                    else:
-                        roll_result = f"{total}>{threshold}, {lvl_map[lvl]}检定失败！"
-            else:
-                roll_result = f"{total}"
-
-            return f"{dice_expression.strip()}: {roll_details}={total}, {roll_result}"
+            return self._evaluate_parsed(self._parse_expression(expression))
 
         except Exception as e:
             return f"错误：{str(e)}"
 
+    @staticmethod
+    @lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def _parse_expression(expression):
+        """
+        解析掷骰表达式中的选项、需求值和骰子表达式，供一次或多次掷骰使用。
+        解析结果不可变，按原始表达式缓存，重复输入相同的表达式时直接复用。
+
+        Args:
+            expression (str): 掷骰表达式，格式同 `evaluate_expression`。
+
+        Raises:
+            ValueError: 如果需求值或骰子表达式格式不正确或无法解析
+
+        Returns:
+            _ParsedExpression: 解析后的掷骰表达式
+        """
+        # 处理选项：只切分一次，将选项从其余部分中分离出来
+        tokens = expression.split()
+        flags = {token for token in tokens if token in _OPTIONS}
+        expression = ' '.join(token for token in tokens if token not in flags)
+        gamble = '-g' in flags
+
+        # 难度分级
+        lvl = 'h' if '-h' in flags else 'e' if '-e' in flags else 'n'
+
+        # 需求值检定
+        if '/' in expression:
+            target, dice_expression = expression.split('/')
+            target = int(target)
+        else:
+            target, dice_expression = None, expression
+
+        # 骰子表达式只在此处去除一次首尾空白，之后的输出直接复用
+        dice_expression = dice_expression.strip()
+        num_dice, dice_type, modifier, modifier_str = _parse_dice(dice_expression)
+
+        return _ParsedExpression(
+            dice_expression, num_dice, dice_type, modifier, modifier_str,
+            target, lvl, gamble, '1d100' in dice_expression,
+        )
+
+    def _evaluate_parsed(self, parsed):
+        """
+        根据预解析的掷骰表达式投掷一次骰子，输出投点结果
+
+        Args:
+            parsed (_ParsedExpression): `_parse_expression` 返回的解析结果。
+
+        Returns:
+            str: 投点结果，格式同 `evaluate_expression`。
+        """
+        total, roll_details = _roll_and_format(
+            parsed.num_dice, parsed.dice_type, parsed.modifier, parsed.modifier_str)
+        if parsed.target is not None:
+            success, threshold = self.check_success(parsed.target, total, parsed.lvl)
+        else:
+            success, threshold = None, None
+        return self._format_result(parsed, total, roll_details, success, threshold)
+
+    def _format_result(self, parsed, total, roll_details, success, threshold):
+        """
+        根据骰点结果和检定结果生成投点结果字符串
+
+        Args:
+            parsed (_ParsedExpression): `_parse_expression` 返回的解析结果。
+            total (int): 骰点结果。
+            roll_details (str): 骰点详情。
+            success (bool): 是否通过检定，未指定需求值时为 None。
+            threshold (int): 通过检定的阈值，未指定需求值时为 None。
+
+        Returns:
+            str: 投点结果，格式同 `evaluate_expression`。
+        """
+        # 骰点详情前缀在各个分支中共用，只拼接一次
+        prefix = f"{parsed.dice_expression}: {roll_details}={total}"
+
+        # 百面骰独有的大成功与大失败机制
+        if parsed.is_d100:
+            if total == 1:
+                return f"{prefix}, 大成功！"
+            if total >= 96:
+                return f"{prefix}, 大失败！"
+
+        # 难度分级
+        lvl_name = _LVL_NAMES[parsed.lvl]
+
+        # 根据骰点结果和需求值进行判断
+        if parsed.target is not None:
+            if success:
+                roll_result = f"{total}<={threshold}, {lvl_name}检定通过！"
+            else:
+                if parsed.gamble:
+                    roll_result = f"{total}>{threshold}, {lvl_name}孤注一掷失败，视为大失败！"
+                else:
+                    roll_result = f"{total}>{threshold}, {lvl_name}检定失败！"
+        else:
+            roll_result = f"{total}"
+
+        return f"{prefix}, {roll_result}"
+
     def quick_roll(self, command):
         """
         快速掷骰子并返回结果。
@@ -184,7 +399,7 @@ class DiceRoller:
                 如果发生错误，则返回错误信息字符串，格式为 "错误：{错误信息}"。
         """
         try:
-            match = re.match(r'\.r\s*(\d+)?', command)
+            match = _R_RE.fullmatch(command.strip())
             if match:
                 dice_type = int(match.group(1)) if match.group(1) else 100
                 dice_expression = f"1d{dice_type}"
@@ -216,14 +431,14 @@ class DiceRoller:
 
         try:
             # m型模式：.m -n expression
-            m_match = re.match(r'\.m\s+-(\d+)\s+(.+)', command)
+            m_match = _M_RE.fullmatch(command.strip())
             if m_match:
                 times = int(m_match.group(1))
                 expression = m_match.group(2)
                 return self._execute_rolls(times, expression)
 
             # d/t型模式：.d/.t expression
-            dt_match = re.match(r'\.(d|t)\s+(.+)', command)
+            dt_match = _DT_RE.fullmatch(command.strip())
             if dt_match:
                 repeat_type = dt_match.group(1)
                 times = 2 if repeat_type == 'd' else 3
@@ -243,13 +458,39 @@ class DiceRoller:
             times (int): 重复掷骰的次数。
             expression (str): 掷骰表达式，例如 "2d6+3"。
 
+        Raises:
+            ValueError: 如果掷骰表达式格式不正确或无法解析
+
         Returns:
             str: 多次掷骰的结果字符串，每行显示一次掷骰的结果，格式为 "第 X 次 -> 结果"。
         """
-        results = []
-        for i in range(times):
-            roll_result = self.evaluate_expression(expression)
-            results.append(f"第 {i+1} 次 -> {roll_result}")
+        # 表达式在每次掷骰间保持不变，只需解析并校验一次；之后的掷骰不会抛出异常，无需逐次捕获
+        parsed = self._parse_expression(expression)
+        num_dice, dice_type = parsed.num_dice, parsed.dice_type
+
+        if (_RNG is not None and times * num_dice >= _NP_MIN_BATCH
+                and num_dice * dice_type <= _NP_MAX_SUM):
+            # 一次性生成全部投掷的点数并按行求和；修正值可能超出 int64，转换为 Python 整数后再相加
+            rolls = _batch_roll(num_dice, dice_type, times)
+            sums = rolls.sum(axis=1).tolist()
+
+            # 最后统一判断检定结果并生成结果字符串
+            modifier, modifier_str, target = parsed.modifier, parsed.modifier_str, parsed.target
+            check_success, format_result = self.check_success, self._format_result
+            results = []
+            for i, (row, roll_sum) in enumerate(zip(rolls.tolist(), sums), 1):
+                total = roll_sum + modifier
+                if target is not None:
+                    success, threshold = check_success(target, total, parsed.lvl)
+                else:
+                    success, threshold = None, None
+                roll_details = '+'.join([str(r) for r in row]) + modifier_str
+                results.append(
+                    f"第 {i} 次 -> {format_result(parsed, total, roll_details, success, threshold)}")
+        else:
+            # 循环前绑定方法，避免每次迭代都查找属性
+            evaluate = self._evaluate_parsed
+            results = [f"第 {i} 次 -> {evaluate(parsed)}" for i in range(1, times + 1)]
         return "\n".join(results)
 
 